@@ -1,5 +1,4 @@
 import math
-import random
 import sys
 
 import numpy as np
@@ -7,19 +6,26 @@ import pygame as pg
 import pytweening
 
 from scipy.spatial import Voronoi
-from shapely.geometry import Polygon
-from shapely.affinity import rotate, scale, translate
 
 
+BLACK       = pg.Color(0, 0, 0)
 DARKEST     = pg.Color('#121212')
-TRANSPARENT = pg.Color('#ff00ff')
+WHITE       = pg.Color(255, 255, 255)
 
+ROTATION_STEP = 2  # Degrees per cached rotation bucket; 360 / 2 = at most 180 cached surfaces per shard
+SWEEP_FRAMES  = 60
+SWEEP_EASING  = np.array([pytweening.easeInOutQuint(f / SWEEP_FRAMES) for f in range(SWEEP_FRAMES)])
 
-class Shard():
-    def __init__(self, image: pg.Surface, poly: Polygon):
-        self.poly = poly
 
-        x_min, y_min, x_max, y_max = self.poly.bounds
+class Shard():
+    def __init__(self, image: pg.Surface, points: np.ndarray, rotation_delta: float, sweep_rotation_delta: int):
+        # The outline is only needed to build the mask and glare,
+        # so per frame only the centroid moves; rotating about it leaves it in place.
+        self.points = points  # (N, 2) polygon vertices at creation
+        self.centroid = polygon_centroid(points).tolist()  # Plain [x, y] floats; cheaper than ndarray element math
+
+        x_min, y_min = self.points.min(axis=0)
+        x_max, y_max = self.points.max(axis=0)
         poly_width = x_max - x_min
         poly_height = y_max - y_min
 
@@ -29,6 +35,7 @@ class Shard():
         self.masked_poly = None  # pg.Surface
         self.motion_frame = 0
         self.rotation_angle = 0
+        self.rotation_cache = {}  # Rotation bucket (degrees) -> rotated pg.Surface
         self.topleft = (x_min, y_min)
         self.tween_coords = []
 
@@ -37,122 +44,175 @@ class Shard():
         self.rotated_rect = self.cropped_rect.copy()
 
         self.create_masked_poly()
-        self.set_rotation(-1, 1)  # Create a little initial motion in the pattern of cracks
+        self.rotation_cache[0] = self.masked_poly  # Near-zero angles are drawn unrotated
+        self.rotation_delta = rotation_delta  # Create a little initial motion in the pattern of cracks
+        self.sweep_rotation_delta = sweep_rotation_delta
+        self.prerender_rotations()
+        self.rotate_image()
 
     def begin_sweep(self):
         self.in_motion = True
         self.friction = 1
-        self.rotation_delta = random.choice([-5, -4, -3, 3, 4, 5])
-
-    def centroid_vector(self) -> pg.Vector2:
-        return pg.Vector2(self.poly.centroid.x, self.poly.centroid.y)
+        self.rotation_delta = self.sweep_rotation_delta
 
     def create_masked_poly(self):
-        poly_points = [tuple([p[0] - self.topleft[0], p[1] - self.topleft[1]]) for p in self.poly.exterior.coords]
+        poly_points = (self.points - self.topleft).tolist()
 
-        surface = self.cropped_image.copy()
-        surface.fill(pg.Color(0, 0, 0))
-        pg.draw.polygon(surface, pg.Color(255, 255, 255), poly_points)
+        surface = pg.Surface(self.cropped_rect.size, 0, self.cropped_image)  # Same pixel format, no pixel copy
+        surface.fill(BLACK)
+        pg.draw.polygon(surface, WHITE, poly_points)
         surface.blit(self.cropped_image, (0, 0), special_flags=pg.BLEND_RGBA_MIN)
-
-        pxarray = pg.PixelArray(surface)
-        pxarray.replace(pg.Color(0, 0, 0), TRANSPARENT)
+        surface.set_colorkey(BLACK)  # Everything outside the polygon is black
 
         self.masked_poly = surface
-        self.masked_poly = pxarray.make_surface()
-        self.masked_poly.set_colorkey(TRANSPARENT)
+
+    @property
+    def moving(self) -> bool:
+        # A settled shard's cached rotated image and topleft are still current
+        return bool(self.rotation_delta or self.in_motion)
+
+    def hide(self):
+        self.display = False
+        self.rotation_cache.clear()  # Never drawn again
+
+    def prerender_rotations(self):
+        # Replay the angle schedule update() will follow so the main loop only has to look surfaces up:
+        # the damped wobble of the cracks, then a constant spin until the sweep carries the shard off-screen.
+        angle, delta = self.rotation_angle, self.rotation_delta
+        while delta:
+            angle += delta
+            delta = delta * self.friction if abs(delta) > .05 else 0
+            self.rotated_surface(angle)
+
+        start_x = self.topleft[0]
+        for easing in SWEEP_EASING.tolist():
+            angle += self.sweep_rotation_delta
+            x = start_x + easing * (-start_x - 200)  # Same path translate() will tween along
+            if x + self.rotated_surface(angle).get_width() < 0:
+                break
+
+    def rotated_surface(self, angle: float) -> pg.Surface:
+        # Falls back to rotating on demand if the sweep starts before the wobble has settled
+        bucket = round(angle / ROTATION_STEP) * ROTATION_STEP % 360
+        rotated = self.rotation_cache.get(bucket)
+        if rotated is None:
+            rotated = pg.transform.rotate(self.masked_poly, bucket * -1)
+            self.rotation_cache[bucket] = rotated
+
+        return rotated
 
     def rotate_image(self) -> tuple[pg.Surface, pg.Rect]:
-        self.rotated_image = pg.transform.rotate(self.masked_poly, self.rotation_angle * -1)
+        self.rotated_image = self.rotated_surface(self.rotation_angle)
         self.rect = self.rotated_image.get_rect()
-        centroid_delta = self.centroid_vector() - self.rect.center
 
-        self.topleft = tuple(self.rect.topleft + centroid_delta)
+        # Keep the rotated image centered on the shard's centroid
+        center_x, center_y = self.rect.center
+        centroid_x, centroid_y = self.centroid
+        self.topleft = (centroid_x - center_x, centroid_y - center_y)
 
-    def set_rotation(self, range_min: int, range_max: int):
-        self.rotation_delta = random.uniform(range_min, range_max)
+    def screen_rect(self) -> pg.Rect:
+        return self.rotated_image.get_rect(topleft=self.topleft)
 
     def translate(self):
         if not self.tween_coords:
             start_x = self.topleft[0]
             end_x = -start_x - 200
-            self.tween_coords = [start_x + pytweening.easeInOutQuint(f / 60) * end_x for f in range(60)]
+            self.tween_coords = (start_x + SWEEP_EASING * end_x).tolist()
 
-        delta = self.tween_coords[self.motion_frame] - self.topleft[0]
-        self.poly = translate(self.poly, delta)
+        self.centroid[0] += self.tween_coords[self.motion_frame] - self.topleft[0]
 
     def update(self):
+        if not self.moving:
+            return
+
         self.rotation_angle += self.rotation_delta
         self.rotation_delta = self.rotation_delta * self.friction if abs(self.rotation_delta) > .05 else 0
 
         self.rotate_image()
-        self.poly = rotate(self.poly, self.rotation_delta, origin=self.poly.centroid)
 
         if self.in_motion:
             self.translate()
             self.motion_frame = min(self.motion_frame + 1, len(self.tween_coords) - 1)
 
             if self.motion_frame == len(self.tween_coords) - 1:
-                self.display = False
-
-
-def create_shards(screen_dims: tuple[int], image: pg.Surface) -> list[Shard]:
-    vertices = create_vertices(screen_dims)
-    return create_voronoi_shards(vertices, screen_dims, image)
+                self.hide()
 
 
-def create_vertices(screen_dims: tuple[int], num_vertices: int = 100) -> list[pg.Vector2]:
-    random_vertices = [pg.Vector2(p) for p in list(zip(
-        np.random.uniform(0, screen_dims[0], num_vertices),
-        np.random.uniform(0, screen_dims[1], num_vertices)))]
+def create_shards(screen_dims: tuple[int], image: pg.Surface, rng: np.random.Generator) -> list[Shard]:
+    vertices = create_vertices(screen_dims, rng)
+    shards = create_voronoi_shards(vertices, screen_dims, image, rng)
 
-    # For each vert, reflect it across all screen edges.
-    # Adding these reflected verts to the initial set ensures the diagram includes lines along the screen edges.
-    reflected = []
-    for pt in random_vertices:
-        delta = screen_dims[0] - pt.x
-        reflected.append(pg.Vector2(pt.x * -1, pt.y))               # Reflect across left edge
-        reflected.append(pg.Vector2(screen_dims[0] + delta, pt.y))  # Reflect across right edge
+    # Left to right, so the sweep front can walk through them in order
+    return sorted(shards, key=lambda s: s.centroid[0])
 
-        delta = screen_dims[1] - pt.y
-        reflected.append(pg.Vector2(pt.x, screen_dims[1] + delta))  # Reflect across bottom edge
-        reflected.append(pg.Vector2(pt.x, pt.y * -1))               # Reflect across top edge
 
-    return random_vertices + reflected
+def create_glare_surface(screen_dims: tuple[int], shards: list[Shard]) -> pg.Surface:
+    # Rendered once at full opacity; the fade is applied per frame with set_alpha()
+    glare_surface = pg.Surface(screen_dims, pg.SRCALPHA).convert_alpha()
+    for shard in shards:
+        pg.draw.polygon(glare_surface, WHITE, shard.points.tolist())
 
+    return glare_surface
 
-def create_voronoi_shards(vertices: list[pg.Vector2], screen_dims: tuple[int], image: pg.Surface) -> list[Shard]:
-    vor = Voronoi(np.array([[v.x, v.y] for v in vertices]))
 
-    polygons = []
-    for region in vor.regions:
-        polygons.append(Polygon(vor.vertices[region]))
+def create_vertices(screen_dims: tuple[int], rng: np.random.Generator, num_vertices: int = 100) -> np.ndarray:
+    # Returned as a float64 (N, 2) array, which is what Voronoi consumes
+    width, height = screen_dims
 
-    # Drop polygons which have any points outside the bounding box
-    filtered_polys = []
-    for poly in polygons:
-        valid = True
+    # Reflect every vert across all screen edges.
+    # Adding these reflected verts to the initial set ensures the diagram includes lines along the screen edges.
+    # All five copies share one buffer and are reflected in place.
+    vertices = np.empty((5, num_vertices, 2))
+    vertices[:] = rng.uniform((0, 0), (width, height), size=(num_vertices, 2))
+    vertices[1, :, 0] *= -1                              # Reflect across left edge
+    vertices[2, :, 0] = 2 * width - vertices[2, :, 0]    # Reflect across right edge
+    vertices[3, :, 1] = 2 * height - vertices[3, :, 1]   # Reflect across bottom edge
+    vertices[4, :, 1] *= -1                              # Reflect across top edge
+
+    return vertices.reshape(-1, 2)
+
+
+def create_voronoi_shards(vertices: np.ndarray, screen_dims: tuple[int], image: pg.Surface,
+                          rng: np.random.Generator) -> list[Shard]:
+    vor = Voronoi(vertices)
+
+    # Bounds-test every Voronoi vertex once, then drop regions which are unbounded or have any points outside the box
+    xs, ys = vor.vertices[:, 0], vor.vertices[:, 1]
+    in_bounds = (xs >= -1) & (xs <= screen_dims[0] + 1) & (ys >= -1) & (ys <= screen_dims[1] + 1)
+
+    filtered_regions = [region for region in vor.regions
+                        if region and -1 not in region and in_bounds[region].all()]
+    if not filtered_regions:
+        return []
+
+    # Scale every kept poly down about its own bounding box center in one pass over the flattened vertices.
+    # points holds each region's vertices back to back; starts[i] is where region i begins and counts[i] its length.
+    counts = [len(region) for region in filtered_regions]
+    starts = np.cumsum([0] + counts[:-1])
+    points = vor.vertices[np.concatenate(filtered_regions)]
+    centers = (np.minimum.reduceat(points, starts) + np.maximum.reduceat(points, starts)) / 2
+    centers = np.repeat(centers, counts, axis=0)
+    filtered_polys = np.split((points - centers) * 0.9 + centers, starts[1:])
+
+    # Draw every shard's random rotations up front; tolist() keeps the per-frame math on Python floats/ints
+    rotation_deltas = rng.uniform(-1, 1, len(filtered_polys)).tolist()
+    sweep_rotation_deltas = rng.choice([-5, -4, -3, 3, 4, 5], len(filtered_polys)).tolist()
 
-        if len(poly.exterior.coords):
-            for pt in poly.exterior.coords:
-                if pt[0] < -1 or pt[0] > screen_dims[0] + 1:
-                    valid = False
-                    break
-                if pt[1] < -1 or pt[1] > screen_dims[1] + 1:
-                    valid = False
-                    break
+    shards = []
+    for pts, rotation_delta, sweep_rotation_delta in zip(filtered_polys, rotation_deltas, sweep_rotation_deltas):
+        shards.append(Shard(image, pts, rotation_delta, sweep_rotation_delta))
 
-            if valid:
-                filtered_polys.append(poly)
+    return shards
 
-    polygons = None
 
-    # Scale down each poly & create Shard objects
-    shards = []
-    for poly in filtered_polys:
-        shards.append(Shard(image, scale(poly, 0.9, 0.9)))
+def polygon_centroid(points: np.ndarray) -> np.ndarray:
+    # Area centroid via the shoelace formula
+    xs, ys = points[:, 0], points[:, 1]
+    next_xs, next_ys = np.roll(xs, -1), np.roll(ys, -1)
+    cross = xs * next_ys - next_xs * ys
+    area_6 = 3 * cross.sum()  # 6 * signed area
 
-    return shards
+    return np.array([((xs + next_xs) * cross).sum() / area_6, ((ys + next_ys) * cross).sum() / area_6])
 
 
 def resize_image_and_set_dims(filename: str, max_size: int) -> tuple:
@@ -184,21 +244,30 @@ def main(filename: str='zanarkand.png'):
     pg.display.set_caption('FFX Shatter Transition')
     image, screen_dims = resize_image_and_set_dims(filename, max_size=512)
     screen = pg.display.set_mode(screen_dims)
+    image = image.convert()  # Match the display format so shard surfaces (copied from it) blit without conversion
     clock = pg.time.Clock()
     target_framerate = 30
 
-    shards = create_shards(screen_dims, image)
+    rng = np.random.default_rng()
+    shards = create_shards(screen_dims, image, rng)
+    glare_surface = create_glare_surface(screen_dims, shards)
     glare_alpha_max = 130
     glare_alpha = glare_alpha_max
     glare_counter = 1.0
     sweep_x = 16
-    motion_surface = pg.Surface(screen_dims, pg.SRCALPHA)
+    sweep_order = shards  # Not pruned, so sweep_idx stays valid
+    sweep_idx = 0
+    motion_surface = pg.Surface(screen_dims, pg.SRCALPHA).convert_alpha()
+    motion_color = pg.Color(DARKEST)  # Alpha is updated in place each blurred frame
 
     cooldown_timer = 0
     paused = True
     motion_blur = False
     reset_ready = False
     running = True
+    still_shown = False  # Paused image is already on the display
+    glare_shown = False  # Glare was visible in the previous frame
+    window_exposed = False  # The OS discarded the window contents; repaint all of it
 
     while running:
         clock.tick(target_framerate)
@@ -206,68 +275,95 @@ def main(filename: str='zanarkand.png'):
         for event in pg.event.get():
             if event.type == pg.QUIT:
                 running = False
+            elif event.type == pg.WINDOWEXPOSED:
+                still_shown = False
+                window_exposed = True
             elif event.type == pg.MOUSEBUTTONDOWN:
                 if reset_ready:
-                    shards = create_shards(screen_dims, image)
+                    shards = sweep_order = None  # Release the old shards before building the new set
+                    shards = create_shards(screen_dims, image, rng)
+                    glare_surface = create_glare_surface(screen_dims, shards)
                     glare_alpha = glare_alpha_max
                     glare_counter = 1.0
                     sweep_x = 16
+                    sweep_order = shards
+                    sweep_idx = 0
 
                     cooldown_timer = 0
                     paused = True
                     motion_blur = False
                     reset_ready = False
+                    still_shown = False
                 else:
                     paused = False
 
+        if paused:
+            # Nothing changes until the first click, so only draw and flip the image once
+            if not still_shown:
+                screen.blit(image, (0, 0))
+                pg.display.flip()
+                still_shown = True
+                window_exposed = False
+            continue
+
+        # Glare and motion blur touch the whole screen; otherwise only moving shards need to reach the display
+        full_redraw = bool(glare_alpha or glare_shown or motion_blur or window_exposed)
+        glare_shown = bool(glare_alpha)
+        window_exposed = False
+        dirty_rects = []
+
         if motion_blur:
             screen.blit(motion_surface, (0, 0))
         else:
             screen.fill(DARKEST)
 
-        if paused:
-            screen.blit(image, (0, 0))
-        else:
-            if glare_alpha:
-                glare_surface = pg.Surface(screen_dims, pg.SRCALPHA)
-
-            for shard in shards:
+        for shard in shards:
+            if shard.display and shard.moving:
+                dirty_rects.append(shard.screen_rect())
                 shard.update()
+                dirty_rects.append(shard.screen_rect())
 
-                if shard.display:
-                    screen.blit(shard.rotated_image, shard.topleft)
+        # Draw all visible shards in one call instead of one blit per shard
+        screen.fblits([(s.rotated_image, s.topleft) for s in shards if s.display])
 
-                if glare_alpha:
-                    pg.draw.polygon(glare_surface, pg.Color(255, 255, 255, glare_alpha),
-                                    shard.poly.exterior.coords)
+        # Glare should fade in 0.6 seconds (18 frames)
+        if glare_alpha:
+            glare_surface.set_alpha(glare_alpha)
+            screen.blit(glare_surface, (0, 0))
+            glare_alpha = max(math.floor(pytweening.easeInOutQuad(glare_counter) * glare_alpha_max), 0)
+            glare_counter -= 1 / 18
+        else:
+            # Stop tracking shards which have been swept past the left edge
+            for shard in shards:
+                if shard.display and shard.topleft[0] + shard.rotated_image.get_width() < 0:
+                    shard.hide()
+            shards = [s for s in shards if s.display]
 
-            # Glare should fade in 0.6 seconds (18 frames)
-            if glare_alpha:
-                screen.blit(glare_surface, (0, 0))
-                glare_alpha = max(math.floor(pytweening.easeInOutQuad(glare_counter) * glare_alpha_max), 0)
-                glare_counter -= 1 / 18
-            else:
-                if sweep_x < screen_dims[0]:
-                    sweep_x += random.randint(8, 12)
-                for shard in [s for s in shards if s.centroid_vector().x < sweep_x and not s.in_motion]:
-                    shard.begin_sweep()
+            if sweep_x < screen_dims[0]:
+                sweep_x += int(rng.integers(8, 12, endpoint=True))
+            while sweep_idx < len(sweep_order) and sweep_order[sweep_idx].centroid[0] < sweep_x:
+                sweep_order[sweep_idx].begin_sweep()
+                sweep_idx += 1
 
-                if motion_blur:
-                    motion_surface.blit(screen, (0, 0))
-                    alpha = max(int(-0.15 * sweep_x + 170), 50)
-                    motion_surface.fill(pg.Color(18, 18, 18, alpha))
+            # The blur layer is a uniform translucent dark fill drawn over the previous frame
+            if motion_blur:
+                motion_color.a = max(int(-0.15 * sweep_x + 170), 50)
+                motion_surface.fill(motion_color)
 
-                motion_blur = sweep_x > 330  # Delay before starting blur
+            motion_blur = sweep_x > 330  # Delay before starting blur
 
         if not reset_ready:
             if cooldown_timer:
                 cooldown_timer -= 1
                 if not cooldown_timer:
                     reset_ready = True
-            elif len([s for s in shards if s.motion_frame == len(s.tween_coords) - 1]) == len(shards):
+            elif not shards:  # Finished shards are hidden and pruned, so an empty list means the sweep is done
                 cooldown_timer = 30  # 1s delay after animation is complete
 
-        pg.display.flip()
+        if full_redraw:
+            pg.display.flip()
+        elif dirty_rects:
+            pg.display.update(dirty_rects[0].unionall(dirty_rects[1:]))
 
 
 if __name__ == '__main__':